@@ -65,6 +65,10 @@ DATABASES = {
     }
 }
 
+# SQLite ignores the INCLUDE columns of covering indexes (see CodeReview.Meta),
+# which is fine: the index still covers the created_at ordering.
+SILENCED_SYSTEM_CHECKS = ['models.W040']
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -103,5 +107,59 @@ REST_FRAMEWORK = {
 # CORS settings
 CORS_ALLOW_ALL_ORIGINS = True
 
+# Cache (used for static analysis and AI review results). Defaults to
+# per-process memory; set REDIS_URL to share cached results between workers.
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# How long (seconds) static analysis results are cached per unique snippet
+ANALYSIS_CACHE_TIMEOUT = int(os.getenv('ANALYSIS_CACHE_TIMEOUT', 3600))
+
+# Worker processes used to analyze bulk and batch submissions in parallel
+ANALYSIS_POOL_WORKERS = int(os.getenv('ANALYSIS_POOL_WORKERS', os.cpu_count() or 1))
+
+# Celery (runs AI reviews outside the request/response cycle).
+# Set CELERY_TASK_ALWAYS_EAGER=True to run tasks inline without a broker.
+CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', 'redis://localhost:6379/0')
+CELERY_TASK_ALWAYS_EAGER = os.getenv('CELERY_TASK_ALWAYS_EAGER', 'False') == 'True'
+CELERY_TASK_IGNORE_RESULT = True
+
 # OpenAI API Key
-OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
\ No newline at end of file
+OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
+
+# Maximum number of OpenAI review/suggestion calls in flight at once per process
+OPENAI_MAX_CONCURRENCY = int(os.getenv('OPENAI_MAX_CONCURRENCY', 8))
+
+# Models used for AI reviews: code above the token threshold goes to the
+# large model (without prompt compression), everything else (including
+# suggestions) to the small one
+AI_REVIEW_MODEL_SMALL = os.getenv('AI_REVIEW_MODEL_SMALL', 'gpt-4o-mini')
+AI_REVIEW_MODEL_LARGE = os.getenv('AI_REVIEW_MODEL_LARGE', 'gpt-4o')
+AI_REVIEW_TOKEN_THRESHOLD = int(os.getenv('AI_REVIEW_TOKEN_THRESHOLD', 4000))
+
+# How long (seconds) identical code keeps its cached AI review
+AI_REVIEW_CACHE_TIMEOUT = int(os.getenv('AI_REVIEW_CACHE_TIMEOUT', 86400))
+
+# How often (seconds) to check on reviews submitted through the OpenAI Batch API
+AI_REVIEW_BATCH_POLL_INTERVAL = int(os.getenv('AI_REVIEW_BATCH_POLL_INTERVAL', 300))
+
+# Prompt compression for long submissions (see reviewer/prompt_compress.py)
+AI_PROMPT_COMPRESSION = {
+    'enabled': os.getenv('AI_PROMPT_COMPRESSION', 'True') == 'True',
+    # 'lines' keeps structural lines and trims bodies; 'llmlingua' needs the llmlingua package
+    'method': os.getenv('AI_PROMPT_COMPRESSION_METHOD', 'lines'),
+    'threshold_tokens': 2000,  # only compress code longer than this
+    'target_tokens': 1500,  # budget for the 'lines' method
+    'compression_rate': 0.5,  # fraction of tokens kept by the 'llmlingua' method
+}
\ No newline at end of file
@@ -3,8 +3,268 @@ This class provides AI-powered code review using OpenAI's GPT API.
 It integrates with Django settings to get the API key.
 """
 
-from openai import OpenAI
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import weakref
+
+import openai
+from openai import AsyncOpenAI, OpenAI
 from django.conf import settings
+from django.core.cache import cache
+from pydantic import BaseModel, ConfigDict
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_random_exponential
+
+from .prompt_compress import compress_code, count_tokens
+
+# Context window (prompt + completion tokens) of each model we may route to
+CONTEXT_WINDOWS = {
+    "gpt-4o": 128000,
+    "gpt-4o-mini": 128000,
+    "gpt-3.5-turbo": 16385,
+}
+# Assumed for models not listed above
+_DEFAULT_CONTEXT_WINDOW = 16385
+# Per-message formatting overhead plus a safety margin for token estimates
+_MESSAGE_OVERHEAD_TOKENS = 4
+_CONTEXT_MARGIN_TOKENS = 32
+# Never ask for less than this, even for very long prompts
+_MIN_OUTPUT_TOKENS = 128
+# Completion length requested for a review, and the room left for it (plus the
+# instructions and analysis summary) when fitting code into a context window
+_REVIEW_MAX_TOKENS = 700
+_REVIEW_PROMPT_RESERVE_TOKENS = 2000
+
+# Static instructions go in the system message and never vary between requests,
+# so providers can serve them from their prompt cache. Anything that depends on
+# the submission belongs at the end of the user message.
+_SYSTEM_PROMPT = (
+    "You are an expert code reviewer. Give structured, actionable feedback: "
+    "an overall quality assessment, then short findings for best practices, "
+    "bugs, security, performance and refactoring (empty lists where there are none)."
+)
+_SUGGEST_SYSTEM_PROMPT = (
+    "You are a helpful code mentor. Given a list of code issues, provide 3-5 "
+    "specific, actionable improvements. Be concise and practical."
+)
+_SUGGEST_BATCH_SYSTEM_PROMPT = (
+    _SUGGEST_SYSTEM_PROMPT + " Several issue lists are given in '### Snippet k' sections; "
+    "answer each one as one entry of 'replies', in the same order."
+)
+
+
+# Shape of an AI review. The model is constrained to this schema through
+# structured outputs, and ai_feedback stores it as JSON. (The docstring is sent
+# to the model as the schema description.)
+class ReviewOutput(BaseModel):
+    """
+    A structured review of a code submission.
+    """
+    model_config = ConfigDict(extra='forbid')
+
+    quality: str
+    best_practices: list[str]
+    bugs: list[str]
+    security: list[str]
+    performance: list[str]
+    refactor: list[str]
+
+
+# response_format for review requests (strict mode needs every field required
+# and no additional properties, which ReviewOutput guarantees)
+_REVIEW_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "code_review",
+        "strict": True,
+        "schema": ReviewOutput.model_json_schema(),
+    },
+}
+
+
+class SuggestionBatchOutput(BaseModel):
+    """
+    Improvement suggestions for several snippets, one reply per snippet.
+    """
+    model_config = ConfigDict(extra='forbid')
+
+    replies: list[str]
+
+
+_SUGGESTION_BATCH_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "suggestion_batch",
+        "strict": True,
+        "schema": SuggestionBatchOutput.model_json_schema(),
+    },
+}
+
+NO_ISSUES_MESSAGE = "No critical issues found. Code looks good!"
+
+# Batch API job states after which no more results will arrive
+_BATCH_FINAL_STATES = {'completed', 'failed', 'expired', 'cancelled'}
+
+_client = None
+_checker = None
+
+# Long-lived event loop (run in a daemon thread) that synchronous callers -
+# views and Celery tasks - run async OpenAI calls on, so they all share one
+# client and its open connections. Recreated after a fork.
+_loop = None
+_loop_pid = None
+_loop_lock = threading.Lock()
+
+# One AsyncOpenAI client per running event loop, since the client's httpx
+# connection pool is bound to the loop it was first used on. Sync callers all
+# use the shared loop above; under ASGI the server's loop gets its own client.
+_async_clients = weakref.WeakKeyDictionary()
+# Likewise one semaphore per loop capping concurrent API calls. As all sync
+# callers share one loop, this is a process-wide limit for them.
+_semaphores = weakref.WeakKeyDictionary()
+
+# Transient failures worth retrying (with backoff) instead of reporting
+_RETRYABLE_ERRORS = (openai.RateLimitError, openai.APIConnectionError, openai.APITimeoutError)
+
+
+def _get_loop():
+    """
+    Return the process-wide event loop, starting it on first use.
+    """
+    global _loop, _loop_pid
+    with _loop_lock:
+        if _loop is None or _loop_pid != os.getpid():
+            _loop = asyncio.new_event_loop()
+            _loop_pid = os.getpid()
+            threading.Thread(target=_loop.run_forever, name='openai-loop', daemon=True).start()
+        return _loop
+
+
+def submit_async(coroutine):
+    """
+    Start a coroutine on the process-wide event loop without waiting for it.
+
+    Returns:
+    - concurrent.futures.Future: Resolves to the coroutine's result
+    """
+    return asyncio.run_coroutine_threadsafe(coroutine, _get_loop())
+
+
+def run_async(coroutine):
+    """
+    Run a coroutine on the process-wide event loop and wait for its result.
+    Must not be called from a coroutine running on that loop.
+    """
+    return submit_async(coroutine).result()
+
+
+def get_async_client():
+    """
+    Return the shared AsyncOpenAI client for the current event loop.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        # Retries are handled by AICodeChecker._create_chat_completion
+        client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY, max_retries=0)
+        _async_clients[loop] = client
+    return client
+
+
+def _get_semaphore():
+    """
+    Return the semaphore limiting concurrent OpenAI calls on the current loop.
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(settings.OPENAI_MAX_CONCURRENCY)
+        _semaphores[loop] = semaphore
+    return semaphore
+
+
+def validate_review(content):
+    """
+    Check a model reply against ReviewOutput.
+
+    Returns:
+    - str: The review as ReviewOutput JSON
+
+    Raises:
+    - ValueError: If the reply is missing (e.g. a refusal), truncated or
+      doesn't match the schema
+    """
+    return ReviewOutput.model_validate_json(content or '').model_dump_json()
+
+
+def count_prompt_tokens(messages):
+    """
+    Count the tokens the given chat messages take up in the prompt.
+    """
+    return sum(count_tokens(message['content']) + _MESSAGE_OVERHEAD_TOKENS for message in messages)
+
+
+def select_model(code_tokens):
+    """
+    Route small submissions to the cheaper, faster model and large ones to
+    the full model (see AI_REVIEW_TOKEN_THRESHOLD in settings). Uses the
+    size of the code as submitted, before any prompt compression.
+    """
+    if code_tokens > settings.AI_REVIEW_TOKEN_THRESHOLD:
+        return settings.AI_REVIEW_MODEL_LARGE
+    return settings.AI_REVIEW_MODEL_SMALL
+
+
+def max_output_tokens(prompt_tokens, limit, model):
+    """
+    Size max_tokens for a request: at most `limit`, and never more than the
+    room the prompt leaves in the model's context window.
+
+    Parameters:
+    - prompt_tokens (int): Tokens in the chat messages that will be sent
+    - limit (int): Upper bound for the completion length
+    - model (str): The model the request is sent to
+
+    Returns:
+    - int: Value for max_tokens
+    """
+    context_window = CONTEXT_WINDOWS.get(model, _DEFAULT_CONTEXT_WINDOW)
+    available = context_window - prompt_tokens - _CONTEXT_MARGIN_TOKENS
+    return max(_MIN_OUTPUT_TOKENS, min(limit, available))
+
+
+def get_client():
+    """
+    Return the process-wide synchronous OpenAI client (used for streaming and
+    the Batch API, which are called from synchronous code).
+    """
+    global _client
+    if _client is None:
+        _client = OpenAI(api_key=settings.OPENAI_API_KEY)
+    return _client
+
+
+def close_clients():
+    """
+    Close the shared OpenAI clients and their connection pools. Registered
+    to run at process exit by ReviewerConfig.ready().
+    """
+    global _client
+    if _client is not None:
+        _client.close()
+        _client = None
+
+    # A client can only be closed on its own loop. The shared loop is still
+    # running in its thread; clients of other loops (e.g. an ASGI server's,
+    # already stopped at exit) go down with their loop.
+    loop = _loop if _loop_pid == os.getpid() else None
+    client = _async_clients.get(loop) if loop is not None else None
+    if client is not None and loop.is_running():
+        asyncio.run_coroutine_threadsafe(client.close(), loop).result(timeout=5)
+    _async_clients.clear()
+
 
 class AICodeChecker:
     """
@@ -12,17 +272,54 @@ class AICodeChecker:
     - Detailed code review
     - Best practices analysis
     - Suggestions for improvements
+
+    The ``a``-prefixed methods are coroutines so several calls can be awaited
+    concurrently; the plain methods are blocking wrappers around them.
     """
 
-    def __init__(self):
+    @property
+    def client(self):
         """
-        Initialize the OpenAI client using the API key from Django settings.
+        The AsyncOpenAI client shared by all checkers on the current event loop.
         """
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        return get_async_client()
 
-    def review_code(self, code, language='python', analysis_summary=None):
+    @retry(
+        retry=retry_if_exception_type(_RETRYABLE_ERRORS),
+        wait=wait_random_exponential(min=1, max=30),
+        stop=stop_after_attempt(6),
+        reraise=True
+    )
+    async def _create_chat_completion(self, **params):
         """
-        Review the given code and return an AI-powered evaluation.
+        Call chat.completions.create, retrying rate limits and connection
+        errors with jittered exponential backoff. At most
+        OPENAI_MAX_CONCURRENCY calls are in flight at once; the slot is
+        released while waiting to retry.
+        """
+        async with _get_semaphore():
+            return await self.client.chat.completions.create(**params)
+
+    @staticmethod
+    def _cache_key(prefix, *parts):
+        """
+        Build a content-addressed cache key from the given parts.
+        """
+        digest = hashlib.sha256("\0".join(parts).encode()).hexdigest()
+        return f"{prefix}:{digest}"
+
+    def _review_cache_key(self, code, language):
+        """
+        Cache key for the review of the given code, including the model it is
+        routed to. Cheap enough for every lookup: it only counts the code's
+        tokens, without building the prompt.
+        """
+        model = select_model(count_tokens(code))
+        return self._cache_key("aireview-json", language, code, model)
+
+    def build_review_request(self, code, language='python', analysis_summary=None):
+        """
+        Build the chat completion parameters for reviewing the given code.
 
         Parameters:
         - code (str): The source code to review.
@@ -30,57 +327,142 @@ class AICodeChecker:
         - analysis_summary (dict, optional): Results from static analysis like complexity.
 
         Returns:
-        - str: Detailed feedback from the AI.
+        - dict: Keyword arguments for chat.completions.create()
         """
-        try:
-            # Include static analysis results if provided
-            context = ""
-            if analysis_summary:
-                avg_complexity = analysis_summary['complexity'].get('average_complexity', 0)
-                max_complexity = analysis_summary['complexity'].get('max_complexity', 0)
-                maintainability = analysis_summary.get('maintainability_index', 0)
-                total_issues = analysis_summary.get('total_issues', 0)
-
-                context = (
-                    "Static Analysis Summary:\n"
-                    f"- Cyclomatic Complexity: Avg {avg_complexity}, Max {max_complexity}\n"
-                    f"- Maintainability Index: {maintainability}\n"
-                    f"- Issues Found: {total_issues}\n"
-                )
+        # Include static analysis results if provided
+        context = f"Language: {language}\n"
+        if analysis_summary:
+            avg_complexity = analysis_summary['complexity'].get('average_complexity', 0)
+            max_complexity = analysis_summary['complexity'].get('max_complexity', 0)
+            maintainability = analysis_summary.get('maintainability_index', 0)
+            total_issues = analysis_summary.get('total_issues', 0)
 
-            # Prepare the prompt for GPT
-            prompt = (
-                f"You are an expert code reviewer. Review the following {language} code and provide:\n"
-                "1. Overall code quality assessment\n"
-                "2. Best practices violations\n"
-                "3. Potential bugs or edge cases\n"
-                "4. Security concerns\n"
-                "5. Performance improvements\n"
-                "6. Refactoring suggestions\n\n"
-                f"{context}\n"
-                f"Code to review:\n```{language}\n{code}\n```\n"
-                "Provide structured and actionable feedback."
+            context += (
+                "Static Analysis Summary:\n"
+                f"- Cyclomatic Complexity: Avg {avg_complexity}, Max {max_complexity}\n"
+                f"- Maintainability Index: {maintainability}\n"
+                f"- Issues Found: {total_issues}\n"
             )
 
+        model = select_model(count_tokens(code))
+        if model == settings.AI_REVIEW_MODEL_LARGE:
+            # Large submissions go to the large model mostly whole; they are
+            # only trimmed if they would not fit its context window
+            context_window = CONTEXT_WINDOWS.get(model, _DEFAULT_CONTEXT_WINDOW)
+            prompt_code = compress_code(code, max_tokens=context_window - _REVIEW_PROMPT_RESERVE_TOKENS)
+        else:
+            # Long files are trimmed to a token budget before being sent
+            prompt_code = compress_code(code)
+
+        # Prepare the prompt for GPT
+        prompt = f"{context}\n```{language}\n{prompt_code}\n```"
+
+        messages = [
+            {"role": "system", "content": _SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
+        return {
+            'model': model,
+            'messages': messages,
+            'max_tokens': max_output_tokens(count_prompt_tokens(messages), _REVIEW_MAX_TOKENS, model),
+            # Low temperature keeps reviews consistent between runs
+            'temperature': 0.2,
+            'response_format': _REVIEW_RESPONSE_FORMAT,
+        }
+
+    async def areview_code(self, code, language='python', analysis_summary=None):
+        """
+        Review the given code and return an AI-powered evaluation.
+
+        Parameters:
+        - code (str): The source code to review.
+        - language (str): Programming language (default: python).
+        - analysis_summary (dict, optional): Results from static analysis like complexity.
+
+        Returns:
+        - str: The AI's feedback as ReviewOutput JSON (or an error message).
+        """
+        # Identical submissions get identical reviews, so skip the API call
+        key = self._review_cache_key(code, language)
+        cached = await cache.aget(key)
+        if cached is not None:
+            return cached
+
+        try:
             # Call OpenAI API
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an expert code reviewer who provides constructive, detailed feedback."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=1000,
-                temperature=0.7
+            response = await self._create_chat_completion(
+                **self.build_review_request(code, language, analysis_summary)
             )
 
-            # Return AI's response
-            return response.choices[0].message.content
+            message = response.choices[0].message
+            if message.refusal:
+                return f"AI Review unavailable: {message.refusal}"
+            feedback = validate_review(message.content)
 
         except Exception as e:
-            # If something goes wrong, return an error message
+            # If something goes wrong, return an error message (never cached)
             return f"AI Review unavailable: {str(e)}"
 
-    def suggest_improvements(self, code, issues):
+        await cache.aset(key, feedback, timeout=settings.AI_REVIEW_CACHE_TIMEOUT)
+        return feedback
+
+    def review_code_stream(self, code, language='python', analysis_summary=None):
+        """
+        Review the given code, yielding the feedback as it is generated.
+
+        Parameters are the same as for areview_code(). A cached review is
+        yielded as a single chunk; a fresh one is cached once it completes
+        and validates against ReviewOutput.
+
+        Yields:
+        - str: Successive pieces of the AI's feedback (ReviewOutput JSON)
+        """
+        key = self._review_cache_key(code, language)
+        cached = cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+
+        chunks = []
+        try:
+            stream = get_client().chat.completions.create(
+                **self.build_review_request(code, language, analysis_summary),
+                stream=True
+            )
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content or ''
+                if delta:
+                    chunks.append(delta)
+                    yield delta
+
+        except Exception as e:
+            # If something goes wrong, report it in the stream (never cached)
+            yield f"AI Review unavailable: {str(e)}"
+            return
+
+        # Cached in the same normalized form areview_code() stores
+        try:
+            feedback = validate_review("".join(chunks))
+        except ValueError:
+            return
+        cache.set(key, feedback, timeout=settings.AI_REVIEW_CACHE_TIMEOUT)
+
+    @staticmethod
+    def _issue_messages(issues):
+        """
+        The issue descriptions sent to the model (at most five per snippet).
+        """
+        return [issue.get('message', issue.get('type', 'Unknown')) for issue in issues[:5]]
+
+    def _suggestion_cache_key(self, issue_messages):
+        """
+        Cache key for suggestions; independent of the order issues were found in.
+        """
+        return self._cache_key("aisuggest", *sorted(issue_messages), settings.AI_REVIEW_MODEL_SMALL)
+
+    async def asuggest_improvements(self, code, issues):
         """
         Suggest practical improvements based on detected issues.
 
@@ -92,29 +474,211 @@ class AICodeChecker:
         - str: Recommendations from AI
         """
         if not issues:
-            return "No critical issues found. Code looks good!"
+            return NO_ISSUES_MESSAGE
+
+        issue_messages = self._issue_messages(issues)
+        key = self._suggestion_cache_key(issue_messages)
+        cached = await cache.aget(key)
+        if cached is not None:
+            return cached
 
         try:
             # Summarize issues into text for the AI
-            issues_text = "\n".join([f"- {issue.get('message', issue.get('type', 'Unknown'))}" for issue in issues[:5]])
+            issues_text = "\n".join(f"- {message}" for message in issue_messages)
 
-            prompt = (
-                f"Given these code issues:\n{issues_text}\n\n"
-                "Provide 3-5 specific, actionable improvements for this code. Be concise and practical."
-            )
+            prompt = f"Issues:\n{issues_text}"
 
-            # Call OpenAI API
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are a helpful code mentor."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=300,
+            messages = [
+                {"role": "system", "content": _SUGGEST_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ]
+
+            # Call OpenAI API; suggestions are short, so the small model is enough
+            model = settings.AI_REVIEW_MODEL_SMALL
+            response = await self._create_chat_completion(
+                model=model,
+                messages=messages,
+                max_tokens=max_output_tokens(count_prompt_tokens(messages), 300, model),
                 temperature=0.7
             )
 
-            return response.choices[0].message.content
+            suggestions = response.choices[0].message.content
 
         except Exception as e:
             return f"Unable to generate suggestions: {str(e)}"
+
+        await cache.aset(key, suggestions, timeout=settings.AI_REVIEW_CACHE_TIMEOUT)
+        return suggestions
+
+    async def asuggest_improvements_batch(self, issue_lists):
+        """
+        Suggest improvements for several snippets with a single API call.
+
+        Each snippet's issues become a numbered section of one prompt, and the
+        structured reply holds one answer per snippet. Snippets without
+        issues or with cached suggestions are answered without the API; if
+        the reply doesn't have exactly one entry per snippet, each snippet is
+        asked separately.
+
+        Parameters:
+        - issue_lists (list): One list of issues per snippet
+
+        Returns:
+        - list: Recommendations from AI, in the same order as issue_lists
+        """
+        results = [None] * len(issue_lists)
+        pending = []
+        for index, issues in enumerate(issue_lists):
+            if not issues:
+                results[index] = NO_ISSUES_MESSAGE
+                continue
+            issue_messages = self._issue_messages(issues)
+            cached = await cache.aget(self._suggestion_cache_key(issue_messages))
+            if cached is not None:
+                results[index] = cached
+            else:
+                pending.append((index, issue_messages))
+
+        if len(pending) == 1:
+            index, _ = pending[0]
+            results[index] = await self.asuggest_improvements(None, issue_lists[index])
+        elif pending:
+            replies = {}
+            try:
+                sections = []
+                for number, (_, issue_messages) in enumerate(pending, 1):
+                    issues_text = "\n".join(f"- {message}" for message in issue_messages)
+                    sections.append(f"### Snippet {number}\n{issues_text}")
+
+                messages = [
+                    {"role": "system", "content": _SUGGEST_BATCH_SYSTEM_PROMPT},
+                    {"role": "user", "content": "\n\n".join(sections)}
+                ]
+                model = settings.AI_REVIEW_MODEL_SMALL
+                response = await self._create_chat_completion(
+                    model=model,
+                    messages=messages,
+                    max_tokens=max_output_tokens(count_prompt_tokens(messages), 300 * len(pending), model),
+                    temperature=0.7,
+                    response_format=_SUGGESTION_BATCH_RESPONSE_FORMAT
+                )
+
+                parsed = SuggestionBatchOutput.model_validate_json(response.choices[0].message.content or '')
+                # Replies can only be matched to snippets if there is one each
+                if len(parsed.replies) == len(pending):
+                    replies = {number: reply.strip() for number, reply in enumerate(parsed.replies, 1)}
+            except Exception:
+                pass
+
+            missing = []
+            for number, (index, issue_messages) in enumerate(pending, 1):
+                if replies.get(number):
+                    results[index] = replies[number]
+                    await cache.aset(
+                        self._suggestion_cache_key(issue_messages),
+                        replies[number],
+                        timeout=settings.AI_REVIEW_CACHE_TIMEOUT
+                    )
+                else:
+                    missing.append(index)
+
+            if missing:
+                fallback = await asyncio.gather(
+                    *(self.asuggest_improvements(None, issue_lists[index]) for index in missing)
+                )
+                for index, suggestions in zip(missing, fallback):
+                    results[index] = suggestions
+
+        return results
+
+    def submit_review_batch(self, submissions):
+        """
+        Submit reviews to the OpenAI Batch API (results within 24h at half price).
+
+        Parameters:
+        - submissions (list): (custom_id, code, language, analysis_summary) tuples
+
+        Returns:
+        - str: The OpenAI batch ID
+        """
+        lines = [
+            json.dumps({
+                'custom_id': custom_id,
+                'method': 'POST',
+                'url': '/v1/chat/completions',
+                'body': self.build_review_request(code, language, analysis_summary),
+            })
+            for custom_id, code, language, analysis_summary in submissions
+        ]
+        client = get_client()
+        batch_file = client.files.create(
+            file=('reviews.jsonl', "\n".join(lines).encode()),
+            purpose='batch'
+        )
+        batch = client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint='/v1/chat/completions',
+            completion_window='24h'
+        )
+        return batch.id
+
+    def fetch_review_batch(self, batch_id):
+        """
+        Fetch the results of a batch submitted with submit_review_batch().
+
+        Returns:
+        - tuple: (status, results) where results maps custom_id to feedback,
+          or None if the batch is still running
+        """
+        client = get_client()
+        batch = client.batches.retrieve(batch_id)
+        if batch.status not in _BATCH_FINAL_STATES:
+            return batch.status, None
+
+        results = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            for line in client.files.content(file_id).text.splitlines():
+                item = json.loads(line)
+                response = item.get('response') or {}
+                if response.get('status_code') == 200:
+                    message = response['body']['choices'][0]['message']
+                    try:
+                        results[item['custom_id']] = validate_review(message.get('content'))
+                    except ValueError as e:
+                        reason = message.get('refusal') or str(e)
+                        results[item['custom_id']] = f"AI Review unavailable: {reason}"
+                else:
+                    error = item.get('error') or response.get('body', {}).get('error') or {}
+                    results[item['custom_id']] = f"AI Review unavailable: {error.get('message', batch.status)}"
+        return batch.status, results
+
+    def review_code(self, code, language='python', analysis_summary=None):
+        """
+        Blocking version of areview_code() for synchronous callers.
+        """
+        return run_async(self.areview_code(code, language, analysis_summary))
+
+    def suggest_improvements(self, code, issues):
+        """
+        Blocking version of asuggest_improvements() for synchronous callers.
+        """
+        return run_async(self.asuggest_improvements(code, issues))
+
+    def suggest_improvements_batch(self, issue_lists):
+        """
+        Blocking version of asuggest_improvements_batch() for synchronous callers.
+        """
+        return run_async(self.asuggest_improvements_batch(issue_lists))
+
+
+def get_checker():
+    """
+    Return the process-wide AICodeChecker, so every request reuses the same
+    OpenAI clients (and their open HTTPS connections).
+    """
+    global _checker
+    if _checker is None:
+        _checker = AICodeChecker()
+    return _checker
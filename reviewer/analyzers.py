@@ -1,6 +1,25 @@
-from radon.complexity import cc_visit
-from radon.metrics import mi_visit
+from django.conf import settings
+from django.core.cache import cache
+from radon.metrics import h_visit_ast, mi_compute
+from radon.raw import analyze
+from radon.visitors import ComplexityVisitor
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import ast
+import hashlib
+import multiprocessing
 import re
+import threading
+
+# Line patterns for print calls and bare excepts, only used when the code
+# can't be parsed (otherwise these checks use the AST). Lines are screened
+# with a substring test first, so the regexes rarely run.
+_PRINT_RE = re.compile(r'\bprint\s*\(')
+_BARE_EXCEPT_RE = re.compile(r'\bexcept\s*:')
+
+# Worker processes for analyzing many submissions at once (created on first use)
+_analyzer_pool = None
+_analyzer_pool_lock = threading.Lock()
 
 class CodeAnalyzer:
     """
@@ -21,6 +40,34 @@ class CodeAnalyzer:
         self.code = code
         self.language = language
         self.issues = []  # Stores detected issues
+        self._tree = None  # Parsed AST, shared by all checks
+        self._parse_error = None
+        self._parsed = False
+        self._complexity_visitor = None
+
+    def _get_tree(self):
+        """
+        Parse the code once and share the AST between all checks.
+
+        Returns:
+        - ast.Module: The parsed tree, or None if it isn't parseable Python
+        """
+        if not self._parsed:
+            self._parsed = True
+            if self.language == 'python':
+                try:
+                    self._tree = ast.parse(self.code)
+                except Exception as e:
+                    self._parse_error = str(e)
+        return self._tree
+
+    def _get_complexity_visitor(self):
+        """
+        Run Radon's complexity visitor over the shared AST (once).
+        """
+        if self._complexity_visitor is None:
+            self._complexity_visitor = ComplexityVisitor.from_ast(self._get_tree())
+        return self._complexity_visitor
 
     def analyze_complexity(self):
         """
@@ -32,8 +79,11 @@ class CodeAnalyzer:
         if self.language != 'python':
             return {'average_complexity': 0, 'max_complexity': 0}
 
+        if self._get_tree() is None:
+            return {'average_complexity': 0, 'max_complexity': 0, 'error': self._parse_error}
+
         try:
-            results = cc_visit(self.code)
+            results = self._get_complexity_visitor().blocks
             if not results:
                 return {'average_complexity': 0, 'max_complexity': 0}
 
@@ -67,45 +117,65 @@ class CodeAnalyzer:
         - Print statements (should use logging)
         - Bare except clauses
         """
-        lines = self.code.split('\n')
+        tree = self._get_tree()
+        # Unparseable Python falls back to matching print/except line by line
+        match_lines = self.language == 'python' and tree is None
+        long_lines, todos = [], []
+        print_lines, bare_except_lines = [], []
 
-        # Long lines
-        for i, line in enumerate(lines, 1):
+        # Single pass over the lines; results are still reported grouped by type
+        for i, line in enumerate(self.code.split('\n'), 1):
+            # Long lines
             if len(line) > 120:
-                self.issues.append({
+                long_lines.append({
                     'type': 'style',
                     'line': i,
                     'message': f"Line {i} exceeds 120 characters ({len(line)} chars)"
                 })
 
-        # TODO/FIXME comments
-        for i, line in enumerate(lines, 1):
+            # TODO/FIXME comments
             if 'TODO' in line or 'FIXME' in line:
-                self.issues.append({
+                todos.append({
                     'type': 'todo',
                     'line': i,
                     'message': f"Line {i} contains TODO/FIXME comment"
                 })
 
+            if match_lines:
+                if 'print' in line and not line.lstrip().startswith('#') and _PRINT_RE.search(line):
+                    print_lines.append(i)
+                if 'except' in line and _BARE_EXCEPT_RE.search(line):
+                    bare_except_lines.append(i)
+
+        # Print calls and bare excepts from the AST, which ignores mentions
+        # inside strings and comments
+        if tree is not None:
+            print_calls, bare_handlers = set(), set()
+            for node in ast.walk(tree):
+                if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == 'print':
+                    print_calls.add(node.lineno)
+                elif isinstance(node, ast.ExceptHandler) and node.type is None:
+                    bare_handlers.add(node.lineno)
+            print_lines = sorted(print_calls)
+            bare_except_lines = sorted(bare_handlers)
+
+        self.issues.extend(long_lines + todos)
+
         # Print statements
-        if self.language == 'python':
-            for i, line in enumerate(lines, 1):
-                if re.search(r'\bprint\s*\(', line) and not line.strip().startswith('#'):
-                    self.issues.append({
-                        'type': 'debug',
-                        'line': i,
-                        'message': f"Line {i} contains print statement - consider using logging"
-                    })
+        for i in print_lines:
+            self.issues.append({
+                'type': 'debug',
+                'line': i,
+                'message': f"Line {i} contains print statement - consider using logging"
+            })
 
         # Bare except clauses
-        if self.language == 'python':
-            for i, line in enumerate(lines, 1):
-                if 'except:' in line or 'except :' in line:
-                    self.issues.append({
-                        'type': 'error_handling',
-                        'line': i,
-                        'message': f"Line {i} has bare except clause - specify exception type"
-                    })
+        for i in bare_except_lines:
+            self.issues.append({
+                'type': 'error_handling',
+                'line': i,
+                'message': f"Line {i} has bare except clause - specify exception type"
+            })
 
         return self.issues
 
@@ -119,8 +189,21 @@ class CodeAnalyzer:
         if self.language != 'python':
             return 0
 
+        tree = self._get_tree()
+        if tree is None:
+            return 0
+
         try:
-            mi = mi_visit(self.code, multi=True)
+            # Same inputs as radon's mi_visit(code, multi=True), minus re-parsing
+            raw = analyze(self.code)
+            comment_lines = raw.comments + raw.multi
+            comments = comment_lines / float(raw.sloc) * 100 if raw.sloc != 0 else 0
+            mi = mi_compute(
+                h_visit_ast(tree).total.volume,
+                self._get_complexity_visitor().total_complexity,
+                raw.lloc,
+                comments
+            )
             return round(mi, 2) if mi else 0
         except Exception:
             return 0
@@ -147,3 +230,132 @@ class CodeAnalyzer:
             'total_issues': len(self.issues),
             'lines_of_code': len(self.code.split('\n'))
         }
+
+
+def _analyze(code, language):
+    """
+    Analyze one snippet. Module-level so it can be sent to worker processes.
+    """
+    return CodeAnalyzer(code, language).get_analysis_summary()
+
+
+def _analysis_cache_key(code, language):
+    """
+    Cache key for the analysis of the given code (content-addressed).
+    """
+    digest = hashlib.sha256(f"{language}\0{code}".encode()).hexdigest()
+    return f"analysis:{digest}"
+
+
+def get_analyzer_pool():
+    """
+    Return the process pool used to analyze submissions in parallel. Analysis
+    is pure-Python CPU work, so threads would just take turns holding the GIL.
+
+    Workers are started by a forkserver rather than forked from this process,
+    which is multithreaded (web server threads, the OpenAI event loop) - a
+    fork could copy a lock held by another thread and deadlock. _analyze()
+    needs nothing from Django, so fresh workers can run it.
+
+    Returns None in a daemonic process (e.g. a Celery prefork worker), which
+    is not allowed to start child processes.
+    """
+    global _analyzer_pool
+    if multiprocessing.current_process().daemon:
+        return None
+    with _analyzer_pool_lock:
+        if _analyzer_pool is None:
+            _analyzer_pool = ProcessPoolExecutor(
+                max_workers=settings.ANALYSIS_POOL_WORKERS,
+                mp_context=multiprocessing.get_context('forkserver')
+            )
+        return _analyzer_pool
+
+
+def _discard_analyzer_pool(pool):
+    """
+    Drop a broken pool (e.g. after a worker was killed) so the next call
+    starts a fresh one.
+    """
+    global _analyzer_pool
+    with _analyzer_pool_lock:
+        if _analyzer_pool is pool:
+            _analyzer_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _analyze_many(codes, languages):
+    """
+    Analyze several snippets, in the process pool when one is available and
+    inline otherwise (or if the pool breaks).
+    """
+    pool = get_analyzer_pool() if len(codes) > 1 else None
+    if pool is not None:
+        try:
+            return list(pool.map(_analyze, codes, languages))
+        except BrokenProcessPool:
+            _discard_analyzer_pool(pool)
+    return [_analyze(code, language) for code, language in zip(codes, languages)]
+
+
+def shutdown_analyzer_pool():
+    """
+    Stop the analyzer worker processes. Registered to run at process exit by
+    ReviewerConfig.ready().
+    """
+    global _analyzer_pool
+    with _analyzer_pool_lock:
+        pool, _analyzer_pool = _analyzer_pool, None
+    if pool is not None:
+        pool.shutdown(cancel_futures=True)
+
+
+def get_cached_analysis_summary(code, language='python'):
+    """
+    Get CodeAnalyzer(code, language).get_analysis_summary(), reusing the
+    result for code that has been analyzed before. Analysis is deterministic,
+    so results are cached by content hash in Django's cache (shared between
+    workers when it is backed by Redis).
+
+    Parameters:
+    - code (str): The source code to analyze
+    - language (str): Programming language (default: python)
+
+    Returns:
+    - dict: Analysis summary
+    """
+    return cache.get_or_set(
+        _analysis_cache_key(code, language),
+        lambda: _analyze(code, language),
+        timeout=settings.ANALYSIS_CACHE_TIMEOUT
+    )
+
+
+def get_cached_analysis_summaries(snippets):
+    """
+    Like get_cached_analysis_summary(), for many snippets at once. Cache
+    lookups are batched, and when more than one snippet needs analyzing the
+    work is spread over the analyzer process pool.
+
+    Parameters:
+    - snippets (list): (code, language) tuples
+
+    Returns:
+    - list: Analysis summaries, in the same order as snippets
+    """
+    keys = [_analysis_cache_key(code, language) for code, language in snippets]
+    summaries = cache.get_many(keys)
+
+    # Duplicate snippets are only analyzed once
+    missing = {}
+    for key, snippet in zip(keys, snippets):
+        if key not in summaries:
+            missing[key] = snippet
+
+    if missing:
+        codes, languages = zip(*missing.values())
+        fresh = dict(zip(missing, _analyze_many(codes, languages)))
+        cache.set_many(fresh, timeout=settings.ANALYSIS_CACHE_TIMEOUT)
+        summaries.update(fresh)
+
+    return [summaries[key] for key in keys]
@@ -1,4 +1,13 @@
+import atexit
 from django.apps import AppConfig
 class ReviewerConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "reviewer"
+
+    def ready(self):
+        # Django has no shutdown signal; close the shared OpenAI clients and
+        # stop the analyzer worker processes at exit
+        from .ai_checker import close_clients
+        from .analyzers import shutdown_analyzer_pool
+        atexit.register(close_clients)
+        atexit.register(shutdown_analyzer_pool)
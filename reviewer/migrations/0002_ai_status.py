@@ -0,0 +1,38 @@
+# Generated by Django 5.2.7 on 2026-10-15 09:16
+
+from django.db import migrations, models
+
+
+def mark_reviewed_rows_completed(apps, schema_editor):
+    # Reviews created before ai_status existed got their AI feedback inline
+    CodeReview = apps.get_model("reviewer", "CodeReview")
+    CodeReview.objects.exclude(ai_feedback="").update(ai_status="completed")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reviewer", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="codereview",
+            name="ai_status",
+            field=models.CharField(
+                choices=[
+                    ("skipped", "Skipped"),
+                    ("pending", "Pending"),
+                    ("completed", "Completed"),
+                ],
+                default="skipped",
+                max_length=20,
+            ),
+        ),
+        migrations.AddField(
+            model_name="codereview",
+            name="ai_suggestions",
+            field=models.TextField(blank=True),
+        ),
+        migrations.RunPython(mark_reviewed_rows_completed, migrations.RunPython.noop),
+    ]
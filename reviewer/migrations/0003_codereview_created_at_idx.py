@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-15 09:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reviewer", "0002_ai_status"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="codereview",
+            index=models.Index(fields=["-created_at"], name="cr_created_at_idx"),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-15 09:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reviewer", "0003_codereview_created_at_idx"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="codereview",
+            name="cr_created_at_idx",
+        ),
+        migrations.AddIndex(
+            model_name="codereview",
+            index=models.Index(
+                fields=["-created_at"],
+                include=("id", "language", "complexity_score", "ai_status"),
+                name="cr_list_covering",
+            ),
+        ),
+    ]
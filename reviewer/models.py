@@ -2,15 +2,34 @@ from django.db import models
 
 class CodeReview(models.Model):
     #Model to store code review results
+
+    class AIStatus(models.TextChoices):
+        SKIPPED = 'skipped'
+        PENDING = 'pending'
+        COMPLETED = 'completed'
+
     code = models.TextField()
     language = models.CharField(max_length=50, default='python')
     complexity_score = models.FloatField(null=True, blank=True)
     ai_feedback = models.TextField(blank=True)
+    ai_suggestions = models.TextField(blank=True)
+    ai_status = models.CharField(max_length=20, choices=AIStatus.choices, default=AIStatus.SKIPPED)
     issues_found = models.JSONField(default=list)
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Serves the newest-first history listing and analytics export
+            # without a sort. On PostgreSQL the included columns make it
+            # covering, so those reads never touch the wide code/ai_feedback
+            # columns; other databases get a plain created_at index.
+            models.Index(
+                fields=['-created_at'],
+                include=['id', 'language', 'complexity_score', 'ai_status'],
+                name='cr_list_covering',
+            ),
+        ]
     
     def __str__(self):
         return f"Review {self.id} - {self.language} - {self.created_at.strftime('%Y-%m-%d %H:%M')}"
\ No newline at end of file
@@ -0,0 +1,6 @@
+from rest_framework.pagination import CursorPagination
+
+class ReviewHistoryPagination(CursorPagination):
+    #Newest-first pages of reviews; cursors stay stable as new reviews arrive
+    ordering = '-created_at'
+    page_size = 20
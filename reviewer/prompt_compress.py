@@ -0,0 +1,194 @@
+"""
+Shrinks long source files before they are embedded in a review prompt.
+Input tokens dominate both cost and latency for large submissions, so code
+above a token threshold is cut down to a budget while keeping the lines that
+describe its structure (imports, class and function definitions).
+"""
+
+import re
+
+import tiktoken
+from django.conf import settings
+
+# Lines that are always kept so the model still sees the overall structure
+STRUCTURAL_LINE = re.compile(r'^\s*(?:@|(?:async\s+)?def\b|class\b|import\b|from\b)')
+
+# Rough characters-per-token ratio used if the tiktoken encoding is unavailable
+CHARS_PER_TOKEN = 4
+
+_encoding = None
+_encoding_loaded = False
+_llmlingua_compressor = None
+
+
+def _get_encoding():
+    """
+    Load the tokenizer once per process (it reads a large BPE file, downloading
+    it on first use). Returns None if it cannot be loaded.
+    """
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        try:
+            _encoding = tiktoken.encoding_for_model(settings.AI_REVIEW_MODEL_SMALL)
+        except Exception:
+            _encoding = None
+        _encoding_loaded = True
+    return _encoding
+
+
+def count_tokens(text):
+    """
+    Count the tokens in the given text.
+
+    Falls back to a character-based estimate if the encoding cannot be
+    loaded (e.g. the BPE file cannot be downloaded).
+
+    Returns:
+    - int: Number of tokens
+    """
+    encoding = _get_encoding()
+    if encoding is None:
+        return len(text) // CHARS_PER_TOKEN + 1
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def _omitted_marker(indent, count):
+    return f"{indent}... ({count} lines omitted)"
+
+
+def _truncate_lines(lines, costs, target_tokens):
+    """
+    Keep lines from the top until the budget runs out, then a single marker.
+    Used when even the structural lines don't fit.
+    """
+    budget = target_tokens - (count_tokens(_omitted_marker('', len(lines))) + 1)
+    kept = 0
+    while kept < len(lines) and costs[kept] <= budget:
+        budget -= costs[kept]
+        kept += 1
+    omitted = sum(1 for line in lines[kept:] if line.strip())
+    head = lines[:kept]
+    if omitted:
+        head.append(_omitted_marker('', omitted))
+    return "\n".join(head)
+
+
+def _compress_lines(code, target_tokens):
+    """
+    Keep every structural line, then fill the remaining budget with body
+    lines, taking the first line of every block, then the second, and so on,
+    so each function keeps its opening lines. Omitted runs are replaced by a
+    single marker line, whose cost is charged to the budget. If the
+    structural lines alone don't fit, the code is truncated instead.
+    """
+    lines = code.splitlines()
+    costs = [count_tokens(line) + 1 for line in lines]
+    keep = [bool(STRUCTURAL_LINE.match(line)) for line in lines]
+
+    # Group body lines under the structural line that precedes them
+    blocks = [[]]
+    for i, line in enumerate(lines):
+        if keep[i]:
+            blocks.append([])
+        elif line.strip():
+            blocks[-1].append(i)
+    blocks = [block for block in blocks if block]
+
+    # Each block keeps a prefix of its body, so it needs at most one marker
+    # (for the rest); reserve that up front and refund it if the block fits
+    def marker_cost(block):
+        first = lines[block[0]]
+        indent = first[:len(first) - len(first.lstrip())]
+        return count_tokens(_omitted_marker(indent, len(block))) + 1
+
+    markers = [marker_cost(block) for block in blocks]
+    budget = target_tokens - sum(cost for cost, kept in zip(costs, keep) if kept) - sum(markers)
+    if budget < 0:
+        return _truncate_lines(lines, costs, target_tokens)
+
+    kept_counts = [0] * len(blocks)
+    open_blocks = set(range(len(blocks)))
+    while open_blocks:
+        for b in sorted(open_blocks):
+            block = blocks[b]
+            cost = costs[block[kept_counts[b]]]
+            if kept_counts[b] == len(block) - 1:
+                # Keeping the last line makes the marker unnecessary
+                cost -= markers[b]
+            if cost > budget:
+                open_blocks.discard(b)
+                continue
+            keep[block[kept_counts[b]]] = True
+            budget -= cost
+            kept_counts[b] += 1
+            if kept_counts[b] == len(block):
+                open_blocks.discard(b)
+
+    # Markers are indented like the first line they replace
+    compressed = []
+    omitted, indent = 0, ''
+    for i, line in enumerate(lines):
+        if keep[i]:
+            if omitted:
+                compressed.append(_omitted_marker(indent, omitted))
+                omitted = 0
+            compressed.append(line)
+        elif line.strip():
+            if not omitted:
+                indent = line[:len(line) - len(line.lstrip())]
+            omitted += 1
+    if omitted:
+        compressed.append(_omitted_marker(indent, omitted))
+
+    return "\n".join(compressed)
+
+
+def _compress_llmlingua(code, rate):
+    """
+    Compress with LLMLingua-2. Requires the optional ``llmlingua`` package.
+    """
+    global _llmlingua_compressor
+    if _llmlingua_compressor is None:
+        from llmlingua import PromptCompressor
+
+        _llmlingua_compressor = PromptCompressor(
+            model_name="microsoft/llmlingua-2-xlm-roberta-large-meetingbank",
+            use_llmlingua2=True,
+        )
+    result = _llmlingua_compressor.compress_prompt(code, rate=rate, force_tokens=['\n'])
+    return result['compressed_prompt']
+
+
+def compress_code(code, max_tokens=None):
+    """
+    Compress code for a prompt according to settings.AI_PROMPT_COMPRESSION.
+
+    Code below the configured token threshold is returned unchanged.
+
+    Parameters:
+    - code (str): The source code to compress
+    - max_tokens (int, optional): Hard budget to use instead of the configured
+      threshold and target (e.g. to fit a large model's context window).
+      Applied with the 'lines' method, even if compression is disabled.
+
+    Returns:
+    - str: Code within target_tokens or max_tokens ('lines' method) or
+      shortened by compression_rate ('llmlingua' method)
+    """
+    if max_tokens is not None:
+        if count_tokens(code) <= max_tokens:
+            return code
+        return _compress_lines(code, max_tokens)
+
+    config = settings.AI_PROMPT_COMPRESSION
+    if not config['enabled'] or count_tokens(code) <= config['threshold_tokens']:
+        return code
+
+    if config['method'] == 'llmlingua':
+        try:
+            return _compress_llmlingua(code, config['compression_rate'])
+        except Exception:
+            # Missing package or model - fall back to line-based compression
+            pass
+
+    return _compress_lines(code, config['target_tokens'])
@@ -7,12 +7,24 @@ class CodeReviewSerializer(serializers.ModelSerializer):
     class Meta:
         model = CodeReview
         fields = ['id', 'code', 'language', 'complexity_score', 
-                  'ai_feedback', 'issues_found', 'created_at']
-        read_only_fields = ['id', 'complexity_score', 'ai_feedback', 
-                           'issues_found', 'created_at']
+                  'ai_feedback', 'ai_suggestions', 'ai_status', 'issues_found', 'created_at']
+        read_only_fields = ['id', 'complexity_score', 'ai_feedback', 'ai_suggestions',
+                           'ai_status', 'issues_found', 'created_at']
+
+class CodeReviewListSerializer(serializers.ModelSerializer):
+    #Lightweight serializer for review listings (no code or AI feedback)
+    
+    class Meta:
+        model = CodeReview
+        fields = ['id', 'language', 'complexity_score', 'ai_status', 'created_at']
+        read_only_fields = fields
 
 class CodeSubmissionSerializer(serializers.Serializer):
     #Serializer for code submission
     code = serializers.CharField()
     language = serializers.CharField(default='python')
-    use_ai = serializers.BooleanField(default=True)
\ No newline at end of file
+    use_ai = serializers.BooleanField(default=True)
+
+class BulkCodeSubmissionSerializer(serializers.ListSerializer):
+    #Serializer for a list of code submissions
+    child = CodeSubmissionSerializer()
\ No newline at end of file
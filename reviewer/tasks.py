@@ -0,0 +1,139 @@
+"""
+Celery tasks that run the AI review outside the HTTP request.
+"""
+
+import asyncio
+
+from celery import shared_task
+from django.conf import settings
+
+from .ai_checker import get_checker, run_async
+from .analyzers import get_cached_analysis_summary
+from .models import CodeReview
+
+# Most snippets whose suggestions are requested in one batched call
+SUGGESTION_BATCH_SIZE = 8
+
+# Consecutive Batch API errors tolerated before a batch's reviews are given up on
+BATCH_FETCH_MAX_ERRORS = 5
+
+
+def batch_custom_id(review_id):
+    """
+    The custom_id that ties a Batch API request line back to its review.
+    """
+    return f"review-{review_id}"
+
+
+async def _review_with_suggestions(ai_checker, code, language, analysis_summary):
+    """
+    Run the AI review and the issue suggestions concurrently.
+    """
+    return await asyncio.gather(
+        ai_checker.areview_code(code, language, analysis_summary),
+        ai_checker.asuggest_improvements(code, analysis_summary['issues']),
+    )
+
+
+async def _review_many(ai_checker, reviews, analysis_summaries):
+    """
+    Run the AI reviews for several snippets concurrently, asking for their
+    suggestions in batches of SUGGESTION_BATCH_SIZE snippets per call.
+
+    Returns:
+    - tuple: (feedback list, suggestions list), in the same order as reviews
+    """
+    issue_lists = [summary['issues'] for summary in analysis_summaries]
+    feedback, *suggestion_batches = await asyncio.gather(
+        asyncio.gather(*(
+            ai_checker.areview_code(review.code, review.language, summary)
+            for review, summary in zip(reviews, analysis_summaries)
+        )),
+        *(
+            ai_checker.asuggest_improvements_batch(issue_lists[start:start + SUGGESTION_BATCH_SIZE])
+            for start in range(0, len(issue_lists), SUGGESTION_BATCH_SIZE)
+        )
+    )
+    suggestions = [item for batch in suggestion_batches for item in batch]
+    return feedback, suggestions
+
+
+@shared_task
+def run_ai_review(review_id):
+    """
+    Fill in the AI feedback and suggestions for a saved review.
+    """
+    review = CodeReview.objects.get(id=review_id)
+
+    try:
+        analysis_summary = get_cached_analysis_summary(review.code, review.language)
+        ai_checker = get_checker()
+        review.ai_feedback, review.ai_suggestions = run_async(_review_with_suggestions(
+            ai_checker, review.code, review.language, analysis_summary
+        ))
+    except Exception as e:
+        review.ai_feedback = f"AI review not available: {str(e)}"
+
+    review.ai_status = CodeReview.AIStatus.COMPLETED
+    review.save(update_fields=['ai_feedback', 'ai_suggestions', 'ai_status'])
+
+
+@shared_task
+def run_ai_reviews(review_ids):
+    """
+    Fill in the AI feedback and suggestions for reviews submitted together
+    (e.g. through the bulk endpoint). Handling them in one task lets their
+    suggestions share API calls.
+    """
+    reviews = list(CodeReview.objects.filter(id__in=review_ids))
+
+    try:
+        # Analyzed inline: prefork workers are daemonic and can't start the
+        # analyzer process pool
+        analysis_summaries = [
+            get_cached_analysis_summary(review.code, review.language) for review in reviews
+        ]
+        feedback, suggestions = run_async(_review_many(get_checker(), reviews, analysis_summaries))
+    except Exception as e:
+        feedback = [f"AI review not available: {str(e)}"] * len(reviews)
+        suggestions = [review.ai_suggestions for review in reviews]
+
+    for review, review_feedback, review_suggestions in zip(reviews, feedback, suggestions):
+        review.ai_feedback = review_feedback
+        review.ai_suggestions = review_suggestions
+        review.ai_status = CodeReview.AIStatus.COMPLETED
+    CodeReview.objects.bulk_update(reviews, ['ai_feedback', 'ai_suggestions', 'ai_status'], batch_size=100)
+
+
+@shared_task(bind=True, max_retries=None)
+def collect_review_batch(self, batch_id, review_ids, errors=0):
+    """
+    Store the results of an OpenAI Batch API job, polling until it finishes.
+    Errors talking to the API are retried at the same interval; after
+    BATCH_FETCH_MAX_ERRORS in a row the reviews are marked as unavailable.
+    """
+    try:
+        batch_status, results = get_checker().fetch_review_batch(batch_id)
+    except Exception as e:
+        if errors + 1 < BATCH_FETCH_MAX_ERRORS:
+            raise self.retry(
+                args=(batch_id, review_ids),
+                kwargs={'errors': errors + 1},
+                countdown=settings.AI_REVIEW_BATCH_POLL_INTERVAL
+            )
+        batch_status, results = f"unavailable ({str(e)})", {}
+
+    if results is None:
+        raise self.retry(
+            args=(batch_id, review_ids),
+            kwargs={'errors': 0},
+            countdown=settings.AI_REVIEW_BATCH_POLL_INTERVAL
+        )
+
+    reviews = list(CodeReview.objects.filter(id__in=review_ids))
+    for review in reviews:
+        review.ai_feedback = results.get(
+            batch_custom_id(review.id), f"AI Review unavailable: batch {batch_status}"
+        )
+        review.ai_status = CodeReview.AIStatus.COMPLETED
+    CodeReview.objects.bulk_update(reviews, ['ai_feedback', 'ai_status'], batch_size=100)
@@ -3,7 +3,11 @@ from . import views
 
 urlpatterns = [
     path('review/', views.review_code, name='review_code'),
+    path('review/stream/', views.review_code_stream, name='review_code_stream'),
+    path('review/batch/', views.review_batch, name='review_batch'),
     path('reviews/', views.get_review_history, name='review_history'),
+    path('reviews/bulk/', views.review_bulk, name='review_bulk'),
+    path('reviews/export/', views.analytics_export, name='analytics_export'),
     path('review/<int:review_id>/', views.get_review_detail, name='review_detail'),
     path('health/', views.health_check, name='health_check'),
 ]
\ No newline at end of file
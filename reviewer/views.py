@@ -1,10 +1,50 @@
+import csv
+import itertools
+import json
+
+from django.conf import settings
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.urls import reverse
 from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from .models import CodeReview
-from .serializers import CodeReviewSerializer, CodeSubmissionSerializer
-from .analyzers import CodeAnalyzer
-from .ai_checker import AICodeChecker
+from .pagination import ReviewHistoryPagination
+from .serializers import (
+    BulkCodeSubmissionSerializer, CodeReviewListSerializer, CodeReviewSerializer, CodeSubmissionSerializer
+)
+from .analyzers import get_cached_analysis_summaries, get_cached_analysis_summary
+from .ai_checker import get_checker, submit_async, validate_review
+from .tasks import batch_custom_id, collect_review_batch, run_ai_review, run_ai_reviews
+
+
+def _status_url(request, review_id):
+    # Clients poll this until ai_status is "completed"
+    return request.build_absolute_uri(reverse('review_detail', args=[review_id]))
+
+def _analyze_submissions(submissions):
+    """
+    Run static analysis on each submission and build (unsaved) reviews,
+    pending an AI review if the submission asked for one.
+
+    Returns:
+    - list: (CodeReview, analysis summary) pairs, in submission order
+    """
+    summaries = get_cached_analysis_summaries(
+        [(item['code'], item['language']) for item in submissions]
+    )
+    results = []
+    for item, analysis_summary in zip(submissions, summaries):
+        review = CodeReview(
+            code=item['code'],
+            language=item['language'],
+            complexity_score=analysis_summary['complexity'].get('average_complexity', 0),
+            issues_found=analysis_summary['issues'],
+            ai_status=CodeReview.AIStatus.PENDING if item['use_ai'] else CodeReview.AIStatus.SKIPPED
+        )
+        results.append((review, analysis_summary))
+    return results
 
 @api_view(['POST'])
 def review_code(request):
@@ -19,26 +59,21 @@ def review_code(request):
     use_ai = serializer.validated_data['use_ai']
     
     # Perform static analysis
-    analyzer = CodeAnalyzer(code, language)
-    analysis_summary = analyzer.get_analysis_summary()
+    analysis_summary = get_cached_analysis_summary(code, language)
     
-    # AI-powered review (if requested)
-    ai_feedback = ""
-    if use_ai:
-        try:
-            ai_checker = AICodeChecker()
-            ai_feedback = ai_checker.review_code(code, language, analysis_summary)
-        except Exception as e:
-            ai_feedback = f"AI review not available: {str(e)}"
-    
-    # Save review to database
-    review = CodeReview.objects.create(
-        code=code,
-        language=language,
-        complexity_score=analysis_summary['complexity'].get('average_complexity', 0),
-        ai_feedback=ai_feedback,
-        issues_found=analysis_summary['issues']
-    )
+    # Save review to database. The AI-powered review (if requested) takes
+    # several seconds, so it runs in a Celery task once the row is committed
+    # and the client polls status_url for the result
+    with transaction.atomic():
+        review = CodeReview.objects.create(
+            code=code,
+            language=language,
+            complexity_score=analysis_summary['complexity'].get('average_complexity', 0),
+            issues_found=analysis_summary['issues'],
+            ai_status=CodeReview.AIStatus.PENDING if use_ai else CodeReview.AIStatus.SKIPPED
+        )
+        if use_ai:
+            transaction.on_commit(lambda: run_ai_review.delay(review.id))
     
     # Prepare response
     response_data = {
@@ -51,18 +86,221 @@ def review_code(request):
             'total_issues': analysis_summary['total_issues']
         },
         'issues': analysis_summary['issues'],
-        'ai_feedback': ai_feedback,
+        'ai_status': review.ai_status,
+        'status_url': _status_url(request, review.id),
         'created_at': review.created_at
     }
     
-    return Response(response_data, status=status.HTTP_201_CREATED)
+    return Response(
+        response_data,
+        status=status.HTTP_202_ACCEPTED if use_ai else status.HTTP_201_CREATED
+    )
+
+class _ReviewEventStream:
+    """
+    Relays the AI review as server-sent events, while the issue suggestions
+    are fetched alongside. The review is only marked completed once the whole
+    feedback has arrived and validates and the suggestions are in; if the
+    client disconnects first (even before the stream starts), whatever was
+    received is saved and the review is finished by a background task.
+    """
+
+    def __init__(self, review, analysis_summary):
+        self.review = review
+        self._chunks = []
+        self._feedback = None
+        self._suggestions = None
+        self._completed = False
+        self._closed = False
+        self._events = self._generate(analysis_summary)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._events)
+
+    def _generate(self, analysis_summary):
+        review = self.review
+        checker = get_checker()
+        suggestions = submit_async(checker.asuggest_improvements(review.code, analysis_summary['issues']))
+        yield f"data: {json.dumps({'id': review.id})}\n\n"
+        for delta in checker.review_code_stream(review.code, review.language, analysis_summary):
+            self._chunks.append(delta)
+            yield f"data: {json.dumps({'delta': delta})}\n\n"
+        try:
+            self._feedback = validate_review("".join(self._chunks))
+        except ValueError:
+            pass
+        else:
+            self._suggestions = suggestions.result()
+            self._completed = True
+        ai_status = CodeReview.AIStatus.COMPLETED if self._completed else CodeReview.AIStatus.PENDING
+        yield f"data: {json.dumps({'done': True, 'ai_status': ai_status})}\n\n"
+
+    def close(self):
+        # Called by Django when the response is finished or abandoned
+        if self._closed:
+            return
+        self._closed = True
+        self._events.close()
+
+        review = self.review
+        if self._completed:
+            # Stored in the same normalized form as non-streamed reviews
+            review.ai_feedback = self._feedback
+            review.ai_suggestions = self._suggestions
+            review.ai_status = CodeReview.AIStatus.COMPLETED
+            review.save(update_fields=['ai_feedback', 'ai_suggestions', 'ai_status'])
+        else:
+            review.ai_feedback = "".join(self._chunks)
+            review.save(update_fields=['ai_feedback'])
+            run_ai_review.delay(review.id)
+
+@api_view(['POST'])
+def review_code_stream(request):
+
+    serializer = CodeSubmissionSerializer(data=request.data)
+
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    code = serializer.validated_data['code']
+    language = serializer.validated_data['language']
+
+    # Perform static analysis
+    analysis_summary = get_cached_analysis_summary(code, language)
+
+    review = CodeReview.objects.create(
+        code=code,
+        language=language,
+        complexity_score=analysis_summary['complexity'].get('average_complexity', 0),
+        issues_found=analysis_summary['issues'],
+        ai_status=CodeReview.AIStatus.PENDING
+    )
+
+    response = StreamingHttpResponse(
+        _ReviewEventStream(review, analysis_summary),
+        content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # stop nginx from buffering the stream
+    return response
+
+@api_view(['POST'])
+def review_batch(request):
+
+    serializer = BulkCodeSubmissionSerializer(data=request.data, allow_empty=False)
+
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    analyzed = _analyze_submissions(serializer.validated_data)
+    reviews = [review for review, _ in analyzed]
+    # Every submission in a batch gets an AI review
+    for review in reviews:
+        review.ai_status = CodeReview.AIStatus.PENDING
+
+    with transaction.atomic():
+        CodeReview.objects.bulk_create(reviews, batch_size=100)
+    review_ids = [review.id for review in reviews]
+
+    # Submitted after the commit so no transaction is held open across the
+    # upload; reviews are only kept if the batch was accepted by OpenAI
+    try:
+        batch_id = get_checker().submit_review_batch([
+            (batch_custom_id(review.id), review.code, review.language, analysis_summary)
+            for review, analysis_summary in analyzed
+        ])
+    except Exception as e:
+        CodeReview.objects.filter(id__in=review_ids).delete()
+        return Response(
+            {'error': f"Batch submission failed: {str(e)}"},
+            status=status.HTTP_502_BAD_GATEWAY
+        )
+
+    collect_review_batch.apply_async(
+        (batch_id, review_ids), countdown=settings.AI_REVIEW_BATCH_POLL_INTERVAL
+    )
+
+    return Response({
+        'batch_id': batch_id,
+        'reviews': [
+            {'id': review_id, 'status_url': _status_url(request, review_id)}
+            for review_id in review_ids
+        ]
+    }, status=status.HTTP_202_ACCEPTED)
+
+@api_view(['POST'])
+def review_bulk(request):
+
+    serializer = BulkCodeSubmissionSerializer(data=request.data, allow_empty=False)
+
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    analyzed = _analyze_submissions(serializer.validated_data)
+    reviews = [review for review, _ in analyzed]
+
+    # One transaction and multi-row INSERTs instead of a commit per review;
+    # the AI reviews are queued as a single task (so their suggestions can be
+    # batched) once the rows are committed
+    with transaction.atomic():
+        CodeReview.objects.bulk_create(reviews, batch_size=100)
+        ai_review_ids = [review.id for review in reviews if review.ai_status == CodeReview.AIStatus.PENDING]
+        if ai_review_ids:
+            transaction.on_commit(lambda: run_ai_reviews.delay(ai_review_ids))
+
+    response_data = [
+        {
+            'id': review.id,
+            'language': review.language,
+            'complexity_score': review.complexity_score,
+            'total_issues': analysis_summary['total_issues'],
+            'ai_status': review.ai_status,
+            'status_url': _status_url(request, review.id)
+        }
+        for review, analysis_summary in analyzed
+    ]
+
+    return Response(
+        response_data,
+        status=status.HTTP_202_ACCEPTED if ai_review_ids else status.HTTP_201_CREATED
+    )
 
 @api_view(['GET'])
 def get_review_history(request):
 
-    reviews = CodeReview.objects.all()[:20]  # Last 20 reviews
-    serializer = CodeReviewSerializer(reviews, many=True)
-    return Response(serializer.data)
+    # Only load the listed columns; code and ai_feedback can be many KB per row
+    reviews = CodeReview.objects.only(*CodeReviewListSerializer.Meta.fields)
+    paginator = ReviewHistoryPagination()
+    page = paginator.paginate_queryset(reviews, request)
+    serializer = CodeReviewListSerializer(page, many=True)
+    return paginator.get_paginated_response(serializer.data)
+
+class _Echo:
+    # File-like object for csv.writer that hands each row back instead of storing it
+    def write(self, value):
+        return value
+
+@api_view(['GET'])
+def analytics_export(request):
+
+    # Streams every review as CSV. Rows are fetched 200 at a time and only the
+    # listed columns are loaded, so memory stays flat however many reviews exist.
+    fields = CodeReviewListSerializer.Meta.fields
+    reviews = CodeReview.objects.only(*fields).iterator(chunk_size=200)
+    writer = csv.writer(_Echo())
+    rows = (
+        writer.writerow([getattr(review, field) for field in fields])
+        for review in reviews
+    )
+    response = StreamingHttpResponse(
+        itertools.chain([writer.writerow(fields)], rows),
+        content_type='text/csv'
+    )
+    response['Content-Disposition'] = 'attachment; filename="reviews.csv"'
+    return response
 
 @api_view(['GET'])
 def get_review_detail(request, review_id):